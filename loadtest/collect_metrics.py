@@ -5,50 +5,202 @@ Queries CPU, memory, and network metrics for specified namespaces/pods.
 """
 
 import argparse
+import asyncio
+import functools
+import hashlib
 import json
-import requests
+import os
+import re
+import tempfile
+import time
+import httpx
 from datetime import datetime
-from urllib.parse import urljoin
+from urllib.parse import urlparse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Latency quantiles computed from the shared ingress histogram rate
+LATENCY_PERCENTILES = {'p50': 0.50, 'p95': 0.95, 'p99': 0.99}
+
+# PromQL templates, filled in with a label selector regex and a rate window (minutes)
+POD_QUERY_TEMPLATES = {
+    # CPU Usage (cores)
+    'cpu': 'sum by (namespace, pod) (rate(container_cpu_usage_seconds_total{{namespace=~"{selector}", container!=""}}[{duration}m]))',
+    # Memory Usage (bytes)
+    'mem': 'sum by (namespace, pod) (container_memory_working_set_bytes{{namespace=~"{selector}", container!=""}})',
+    # Network I/O (bytes/sec)
+    'rx': 'sum by (namespace, pod) (rate(container_network_receive_bytes_total{{namespace=~"{selector}"}}[{duration}m]))',
+    'tx': 'sum by (namespace, pod) (rate(container_network_transmit_bytes_total{{namespace=~"{selector}"}}[{duration}m]))',
+}
+
+LATENCY_BASE_TEMPLATE = 'sum by (host, le) (rate(nginx_ingress_controller_request_duration_seconds_bucket{{host=~"{selector}"}}[{duration}m]))'
+
+INGRESS_QUERY_TEMPLATES = {
+    # Request count per host
+    'requests': 'sum by (host) (nginx_ingress_controller_requests{{host=~"{selector}"}})',
+    # Request rate per host
+    'rate': 'sum by (host) (rate(nginx_ingress_controller_requests{{host=~"{selector}"}}[{duration}m]))',
+    # Response time percentiles per host
+    **{label: f'histogram_quantile({percentile}, {LATENCY_BASE_TEMPLATE})' for label, percentile in LATENCY_PERCENTILES.items()},
+}
+
+# Cached results are bucketed by the Prometheus scrape interval
+CACHE_BUCKET_SECONDS = 15
+
+# Cache entries (sha1 keys) and in-flight temp files written by cached_query;
+# expiry only ever touches files matching this
+CACHE_FILE_PATTERN = re.compile(r'^(?:[0-9a-f]{40}\.json|prom-.+\.tmp)$')
+
+# Pod names longer than this are truncated in the Markdown report
+POD_NAME_MAX_LENGTH = 40
+
+# Markdown row for the pod resource table, filled from the report's row index
+POD_ROW_TEMPLATE = "| {ns} | {pod} | {cpu:.2f} | {mem:.2f} | {rx:.2f} | {tx:.2f} |\n"
+
+
+def cached_query(func):
+    """Cache query results on disk, keyed by (server, query, time bucket)."""
+    
+    @functools.wraps(func)
+    async def wrapper(self, promql: str) -> dict:
+        if not self.cache_dir:
+            return await func(self, promql)
+        
+        bucket = int(time.time()) // CACHE_BUCKET_SECONDS
+        key = hashlib.sha1('\0'.join([self.base_url, promql, str(bucket)]).encode()).hexdigest()
+        cache_path = os.path.join(self.cache_dir, f"{key}.json")
+        
+        try:
+            with open(cache_path, 'rb') as f:
+                return parse_json(f.read())
+        except (OSError, ValueError):
+            pass
+        
+        result = await func(self, promql)
+        if result.get('status') == 'success':
+            # Write atomically so concurrent runs never read a partial file;
+            # a failed cache write must not fail the query
+            tmp_path = None
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix='prom-', suffix='.tmp')
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(result, f)
+                os.replace(tmp_path, cache_path)
+            except OSError:
+                if tmp_path:
+                    try:
+                        os.remove(tmp_path)
+                    except OSError:
+                        pass
+        return result
+    
+    return wrapper
+
+
+def parse_json(data: bytes):
+    """Parse JSON bytes, using orjson when it is installed."""
+    return orjson.loads(data) if orjson else json.loads(data)
 
 
 class PrometheusClient:
-    """Simple Prometheus query client."""
+    """Simple asynchronous Prometheus query client."""
     
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, cache_dir: str = None, duration_minutes: int = 5):
         self.base_url = base_url.rstrip('/')
-    
-    def query(self, promql: str) -> dict:
+        self.duration_minutes = duration_minutes
+        # Keep entries in a dedicated subdirectory so expiry never sees foreign files
+        self.cache_dir = os.path.join(cache_dir, 'prom') if cache_dir else None
+        if self.cache_dir:
+            # An unusable cache dir disables caching rather than failing the run
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                self._expire_cache(max_age=5 * duration_minutes * 60)
+            except OSError:
+                self.cache_dir = None
+        # Concurrent queries share keep-alive connections
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(max_keepalive_connections=16),
+            retries=2,
+        )
+        self.client = httpx.AsyncClient(transport=transport, timeout=30)
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    async def close(self):
+        """Close the underlying HTTP client."""
+        await self.client.aclose()
+    
+    def _expire_cache(self, max_age: float):
+        """Remove cached results older than max_age seconds."""
+        cutoff = time.time() - max_age
+        for name in os.listdir(self.cache_dir):
+            if not CACHE_FILE_PATTERN.match(name):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+    
+    @cached_query
+    async def query(self, promql: str) -> dict:
         """Execute an instant query."""
         url = f"{self.base_url}/api/v1/query"
-        response = requests.get(url, params={'query': promql}, timeout=30)
+        response = await self.client.get(url, params={'query': promql})
         response.raise_for_status()
-        return response.json()
+        return parse_json(response.content)
     
-    def query_range(self, promql: str, start: float, end: float, step: str = '15s') -> dict:
+    async def query_range(self, promql: str, start: float, end: float, step: str = '15s') -> dict:
         """Execute a range query."""
         url = f"{self.base_url}/api/v1/query_range"
-        response = requests.get(url, params={
+        response = await self.client.get(url, params={
             'query': promql,
             'start': start,
             'end': end,
             'step': step
-        }, timeout=30)
+        })
         response.raise_for_status()
-        return response.json()
+        return parse_json(response.content)
     
-    def get_scalar_value(self, promql: str) -> float:
+    async def get_scalar_value(self, promql: str) -> float:
         """Get a single scalar value from a query."""
-        result = self.query(promql)
+        result = await self.query(promql)
         if result.get('status') == 'success' and result.get('data', {}).get('result'):
             value = result['data']['result'][0]['value'][1]
             return float(value)
         return 0.0
 
 
-def collect_pod_metrics(client: PrometheusClient, namespaces: list, duration_minutes: int = 5) -> dict:
+def regex_selector(values: list) -> str:
+    """Build an anchored, de-duplicated regex alternation for a label matcher."""
+    return f"^({'|'.join(sorted(set(values)))})$"
+
+
+def render_queries(templates: dict, selector: str, duration_minutes: int) -> dict:
+    """Fill a set of PromQL templates with a selector regex and rate window."""
+    return {name: template.format(selector=selector, duration=duration_minutes) for name, template in templates.items()}
+
+
+def combine_queries(queries: dict, label: str = 'metric') -> str:
+    """Join several PromQL expressions into one, tagging each series with its key."""
+    return ' or '.join(
+        f'label_replace({expr}, "{label}", "{name}", "", "")' for name, expr in queries.items()
+    )
+
+
+async def collect_pod_metrics(client: PrometheusClient, namespaces: list, duration_minutes: int = 5) -> dict:
     """Collect resource utilization metrics for pods in specified namespaces."""
     
-    ns_selector = '|'.join(namespaces)
+    ns_selector = regex_selector(namespaces)
     
     metrics = {
         'namespaces': namespaces,
@@ -59,143 +211,124 @@ def collect_pod_metrics(client: PrometheusClient, namespaces: list, duration_min
         'network': {},
     }
     
-    # CPU Usage (cores)
-    cpu_query = f'sum by (namespace, pod) (rate(container_cpu_usage_seconds_total{{namespace=~"{ns_selector}", container!=""}}[{duration_minutes}m]))'
-    cpu_result = client.query(cpu_query)
-    if cpu_result.get('status') == 'success':
-        for item in cpu_result.get('data', {}).get('result', []):
-            ns = item['metric'].get('namespace', 'unknown')
-            pod = item['metric'].get('pod', 'unknown')
-            value = float(item['value'][1])
-            if ns not in metrics['cpu']:
-                metrics['cpu'][ns] = {}
-            metrics['cpu'][ns][pod] = {
-                'usage_cores': round(value, 4),
-                'usage_millicores': round(value * 1000, 2),
+    # Nothing to select; skip the query rather than send an empty matcher
+    if not namespaces:
+        return metrics
+    
+    # All pod metrics are fetched in a single query, tagged by the "metric" label
+    query = combine_queries(render_queries(POD_QUERY_TEMPLATES, ns_selector, duration_minutes))
+    result = await client.query(query)
+    if result.get('status') != 'success':
+        return metrics
+    
+    # Accumulate every metric per (namespace, pod) in one pass over the series
+    pods = {}
+    for item in result.get('data', {}).get('result', []):
+        labels = item['metric']
+        key = (labels.get('namespace', 'unknown'), labels.get('pod', 'unknown'))
+        pods.setdefault(key, {})[labels.get('metric')] = float(item['value'][1])
+    
+    # Emit the nested cpu/memory/network structures
+    for (ns, pod), values in pods.items():
+        if 'cpu' in values:
+            metrics['cpu'].setdefault(ns, {})[pod] = {
+                'usage_cores': values['cpu'],
+                'usage_millicores': values['cpu'] * 1000,
             }
-    
-    # Memory Usage (bytes)
-    mem_query = f'sum by (namespace, pod) (container_memory_working_set_bytes{{namespace=~"{ns_selector}", container!=""}})'
-    mem_result = client.query(mem_query)
-    if mem_result.get('status') == 'success':
-        for item in mem_result.get('data', {}).get('result', []):
-            ns = item['metric'].get('namespace', 'unknown')
-            pod = item['metric'].get('pod', 'unknown')
-            value = float(item['value'][1])
-            if ns not in metrics['memory']:
-                metrics['memory'][ns] = {}
-            metrics['memory'][ns][pod] = {
-                'usage_bytes': round(value, 0),
-                'usage_mb': round(value / (1024 * 1024), 2),
+        if 'mem' in values:
+            metrics['memory'].setdefault(ns, {})[pod] = {
+                'usage_bytes': values['mem'],
+                'usage_mb': values['mem'] / (1024 * 1024),
             }
-    
-    # Network I/O (bytes/sec)
-    net_rx_query = f'sum by (namespace, pod) (rate(container_network_receive_bytes_total{{namespace=~"{ns_selector}"}}[{duration_minutes}m]))'
-    net_tx_query = f'sum by (namespace, pod) (rate(container_network_transmit_bytes_total{{namespace=~"{ns_selector}"}}[{duration_minutes}m]))'
-    
-    net_rx_result = client.query(net_rx_query)
-    net_tx_result = client.query(net_tx_query)
-    
-    if net_rx_result.get('status') == 'success':
-        for item in net_rx_result.get('data', {}).get('result', []):
-            ns = item['metric'].get('namespace', 'unknown')
-            pod = item['metric'].get('pod', 'unknown')
-            value = float(item['value'][1])
-            if ns not in metrics['network']:
-                metrics['network'][ns] = {}
-            if pod not in metrics['network'][ns]:
-                metrics['network'][ns][pod] = {}
-            metrics['network'][ns][pod]['rx_bytes_per_sec'] = round(value, 2)
-            metrics['network'][ns][pod]['rx_kb_per_sec'] = round(value / 1024, 2)
-    
-    if net_tx_result.get('status') == 'success':
-        for item in net_tx_result.get('data', {}).get('result', []):
-            ns = item['metric'].get('namespace', 'unknown')
-            pod = item['metric'].get('pod', 'unknown')
-            value = float(item['value'][1])
-            if ns not in metrics['network']:
-                metrics['network'][ns] = {}
-            if pod not in metrics['network'][ns]:
-                metrics['network'][ns][pod] = {}
-            metrics['network'][ns][pod]['tx_bytes_per_sec'] = round(value, 2)
-            metrics['network'][ns][pod]['tx_kb_per_sec'] = round(value / 1024, 2)
+        network = {}
+        for direction in ('rx', 'tx'):
+            if direction in values:
+                network[f'{direction}_bytes_per_sec'] = values[direction]
+                network[f'{direction}_kb_per_sec'] = values[direction] / 1024
+        if network:
+            metrics['network'].setdefault(ns, {})[pod] = network
     
     return metrics
 
 
-def collect_ingress_metrics(client: PrometheusClient, hosts: list, duration_minutes: int = 5) -> dict:
+async def collect_ingress_metrics(client: PrometheusClient, hosts: list, duration_minutes: int = 5) -> dict:
     """Collect NGINX Ingress Controller metrics for specified hosts."""
     
-    host_selector = '|'.join(hosts)
+    host_selector = regex_selector(hosts)
     
     metrics = {
         'hosts': hosts,
         'ingress': {},
     }
     
-    # Request count per host
-    req_query = f'sum by (host) (nginx_ingress_controller_requests{{host=~"{host_selector}"}})'
-    req_result = client.query(req_query)
-    if req_result.get('status') == 'success':
-        for item in req_result.get('data', {}).get('result', []):
-            host = item['metric'].get('host', 'unknown')
-            value = float(item['value'][1])
-            if host not in metrics['ingress']:
-                metrics['ingress'][host] = {}
-            metrics['ingress'][host]['total_requests'] = int(value)
+    # Nothing to select; skip the query rather than send an empty matcher
+    if not hosts:
+        return metrics
     
-    # Request rate per host
-    rate_query = f'sum by (host) (rate(nginx_ingress_controller_requests{{host=~"{host_selector}"}}[{duration_minutes}m]))'
-    rate_result = client.query(rate_query)
-    if rate_result.get('status') == 'success':
-        for item in rate_result.get('data', {}).get('result', []):
-            host = item['metric'].get('host', 'unknown')
-            value = float(item['value'][1])
-            if host not in metrics['ingress']:
-                metrics['ingress'][host] = {}
-            metrics['ingress'][host]['requests_per_sec'] = round(value, 2)
+    # All ingress metrics are fetched in a single query, tagged by the "metric" label
+    query = combine_queries(render_queries(INGRESS_QUERY_TEMPLATES, host_selector, duration_minutes))
+    result = await client.query(query)
+    if result.get('status') != 'success':
+        return metrics
     
-    # Response time percentiles per host
-    for percentile, label in [(0.50, 'p50'), (0.95, 'p95'), (0.99, 'p99')]:
-        latency_query = f'histogram_quantile({percentile}, sum by (host, le) (rate(nginx_ingress_controller_request_duration_seconds_bucket{{host=~"{host_selector}"}}[{duration_minutes}m])))'
-        latency_result = client.query(latency_query)
-        if latency_result.get('status') == 'success':
-            for item in latency_result.get('data', {}).get('result', []):
-                host = item['metric'].get('host', 'unknown')
-                value = float(item['value'][1])
-                if host not in metrics['ingress']:
-                    metrics['ingress'][host] = {}
-                metrics['ingress'][host][f'{label}_latency_ms'] = round(value * 1000, 2)
+    for item in result.get('data', {}).get('result', []):
+        kind = item['metric'].get('metric')
+        host = item['metric'].get('host', 'unknown')
+        value = float(item['value'][1])
+        if host not in metrics['ingress']:
+            metrics['ingress'][host] = {}
+    
+        if kind == 'requests':
+            metrics['ingress'][host]['total_requests'] = int(value)
+        elif kind == 'rate':
+            metrics['ingress'][host]['requests_per_sec'] = value
+        elif kind in LATENCY_PERCENTILES:
+            metrics['ingress'][host][f'{kind}_latency_ms'] = value * 1000
     
     return metrics
 
 
+@functools.lru_cache(maxsize=None)
+def display_pod_name(pod: str) -> str:
+    """Truncate long pod names for display, memoized per unique name."""
+    return pod[:POD_NAME_MAX_LENGTH] + '...' if len(pod) > POD_NAME_MAX_LENGTH else pod
+
+
 def generate_markdown_report(pod_metrics: dict, ingress_metrics: dict) -> str:
     """Generate a Markdown report from collected metrics."""
     
-    md = "## 📊 Resource Utilization Metrics\n\n"
-    md += f"*Collected at {pod_metrics.get('collection_time', 'N/A')} (last {pod_metrics.get('duration_minutes', 5)} minutes)*\n\n"
+    parts = ["## 📊 Resource Utilization Metrics\n\n"]
+    parts.append(f"*Collected at {pod_metrics.get('collection_time', 'N/A')} (last {pod_metrics.get('duration_minutes', 5)} minutes)*\n\n")
     
     # CPU and Memory per namespace
-    md += "### Pod Resource Usage\n\n"
-    md += "| Namespace | Pod | CPU (millicores) | Memory (MB) | Network RX (KB/s) | Network TX (KB/s) |\n"
-    md += "|-----------|-----|------------------|-------------|-------------------|-------------------|\n"
-    
-    for ns in pod_metrics.get('cpu', {}):
-        for pod in pod_metrics['cpu'].get(ns, {}):
-            cpu = pod_metrics['cpu'].get(ns, {}).get(pod, {}).get('usage_millicores', 0)
-            mem = pod_metrics['memory'].get(ns, {}).get(pod, {}).get('usage_mb', 0)
-            rx = pod_metrics['network'].get(ns, {}).get(pod, {}).get('rx_kb_per_sec', 0)
-            tx = pod_metrics['network'].get(ns, {}).get(pod, {}).get('tx_kb_per_sec', 0)
-            # Truncate long pod names
-            pod_display = pod[:40] + '...' if len(pod) > 40 else pod
-            md += f"| {ns} | {pod_display} | {cpu} | {mem} | {rx} | {tx} |\n"
+    parts.append("### Pod Resource Usage\n\n")
+    parts.append("| Namespace | Pod | CPU (millicores) | Memory (MB) | Network RX (KB/s) | Network TX (KB/s) |\n")
+    parts.append("|-----------|-----|------------------|-------------|-------------------|-------------------|\n")
+    
+    # Flatten the per-namespace trees into one (namespace, pod) -> row index
+    index = {}
+    for ns, pods in pod_metrics.get('cpu', {}).items():
+        memory = pod_metrics['memory'].get(ns, {})
+        network = pod_metrics['network'].get(ns, {})
+        for pod, cpu in pods.items():
+            net = network.get(pod, {})
+            index[(ns, pod)] = {
+                'ns': ns,
+                'pod': display_pod_name(pod),
+                'cpu': cpu.get('usage_millicores', 0),
+                'mem': memory.get(pod, {}).get('usage_mb', 0),
+                'rx': net.get('rx_kb_per_sec', 0),
+                'tx': net.get('tx_kb_per_sec', 0),
+            }
+    
+    for row in index.values():
+        parts.append(POD_ROW_TEMPLATE.format_map(row))
     
     # Ingress metrics
     if ingress_metrics.get('ingress'):
-        md += "\n### Ingress Controller Metrics (from Prometheus)\n\n"
-        md += "| Host | Requests | Req/sec | p50 (ms) | p95 (ms) | p99 (ms) |\n"
-        md += "|------|----------|---------|----------|----------|----------|\n"
+        parts.append("\n### Ingress Controller Metrics (from Prometheus)\n\n")
+        parts.append("| Host | Requests | Req/sec | p50 (ms) | p95 (ms) | p99 (ms) |\n")
+        parts.append("|------|----------|---------|----------|----------|----------|\n")
         
         for host, data in ingress_metrics.get('ingress', {}).items():
             total_req = data.get('total_requests', 0)
@@ -203,10 +336,15 @@ def generate_markdown_report(pod_metrics: dict, ingress_metrics: dict) -> str:
             p50 = data.get('p50_latency_ms', 0)
             p95 = data.get('p95_latency_ms', 0)
             p99 = data.get('p99_latency_ms', 0)
-            md += f"| {host} | {total_req} | {rps} | {p50} | {p95} | {p99} |\n"
+            parts.append(f"| {host} | {total_req} | {rps:.2f} | {p50:.2f} | {p95:.2f} | {p99:.2f} |\n")
     
-    md += "\n"
-    return md
+    parts.append("\n")
+    return "".join(parts)
+
+
+def comma_separated(value: str) -> list:
+    """Parse a comma-separated CLI argument into a list of stripped items."""
+    return [item.strip() for item in value.split(',') if item.strip()]
 
 
 def load_config_from_urls_file(urls_file: str) -> tuple:
@@ -214,38 +352,35 @@ def load_config_from_urls_file(urls_file: str) -> tuple:
     with open(urls_file, 'r') as f:
         urls_config = json.load(f)
     
-    namespaces = set()
-    hosts = []
-    
-    for entry in urls_config:
-        # Extract namespace
-        if 'namespace' in entry:
-            namespaces.add(entry['namespace'])
-        
-        # Extract host from URL
-        url = entry.get('url', '')
-        if url:
-            # Parse host from URL (e.g., http://foo.localhost -> foo.localhost)
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            if parsed.netloc:
-                hosts.append(parsed.netloc)
-    
     # Always include ingress-nginx namespace for ingress metrics
-    namespaces.add('ingress-nginx')
+    namespaces = {entry['namespace'] for entry in urls_config if 'namespace' in entry} | {'ingress-nginx'}
+    
+    # Parse host from URL (e.g., http://foo.localhost -> foo.localhost)
+    parsed_urls = (urlparse(entry.get('url', '')) for entry in urls_config)
+    hosts = [parsed.netloc for parsed in parsed_urls if parsed.netloc]
     
     return list(namespaces), hosts
 
 
+async def collect_all(prometheus_url: str, namespaces: list, hosts: list, duration_minutes: int = 5,
+                      cache_dir: str = None) -> tuple:
+    """Collect pod and ingress metrics concurrently from one Prometheus client."""
+    async with PrometheusClient(prometheus_url, cache_dir=cache_dir, duration_minutes=duration_minutes) as client:
+        return await asyncio.gather(
+            collect_pod_metrics(client, namespaces, duration_minutes),
+            collect_ingress_metrics(client, hosts, duration_minutes),
+        )
+
+
 def main():
     parser = argparse.ArgumentParser(description='Collect resource metrics from Prometheus')
     parser.add_argument('--prometheus-url', type=str, default='http://localhost:9090',
                         help='Prometheus server URL')
     parser.add_argument('--urls', type=str, default=None,
                         help='JSON file containing URLs config (extracts namespaces and hosts)')
-    parser.add_argument('--namespaces', type=str, default=None,
+    parser.add_argument('--namespaces', type=comma_separated, default=None,
                         help='Comma-separated list of namespaces to monitor (overrides --urls)')
-    parser.add_argument('--hosts', type=str, default=None,
+    parser.add_argument('--hosts', type=comma_separated, default=None,
                         help='Comma-separated list of ingress hosts to monitor (overrides --urls)')
     parser.add_argument('--duration', type=int, default=5,
                         help='Duration in minutes for rate calculations')
@@ -253,32 +388,44 @@ def main():
                         help='Output directory for results')
     parser.add_argument('--output-format', type=str, choices=['json', 'markdown', 'both'],
                         default='both', help='Output format')
+    parser.add_argument('--cache', dest='cache', action='store_true', default=False,
+                        help='Reuse query results cached under --cache-dir within the same scrape window')
+    parser.add_argument('--no-cache', dest='cache', action='store_false',
+                        help='Always query Prometheus, bypassing the result cache (default)')
+    parser.add_argument('--cache-dir', type=str,
+                        default=os.path.join(os.path.expanduser('~'), '.cache', 'collect_metrics'),
+                        help='Directory for cached query results (stored in its prom/ subdirectory)')
+    parser.add_argument('--print-report', action='store_true',
+                        help='Also print the Markdown report to stdout')
     
     args = parser.parse_args()
     
-    import os
     os.makedirs(args.output_dir, exist_ok=True)
     
     print(f"==> Collecting metrics from Prometheus at {args.prometheus_url}")
     
-    client = PrometheusClient(args.prometheus_url)
+    cache_dir = args.cache_dir if args.cache else None
     
     # Load config from urls file or use explicit arguments
     if args.urls and os.path.isfile(args.urls):
-        namespaces_from_file, hosts_from_file = load_config_from_urls_file(args.urls)
-        namespaces = [ns.strip() for ns in args.namespaces.split(',')] if args.namespaces else namespaces_from_file
-        hosts = [h.strip() for h in args.hosts.split(',')] if args.hosts else hosts_from_file
+        default_namespaces, default_hosts = load_config_from_urls_file(args.urls)
     else:
-        namespaces = [ns.strip() for ns in args.namespaces.split(',')] if args.namespaces else ['default', 'ingress-nginx']
-        hosts = [h.strip() for h in args.hosts.split(',')] if args.hosts else ['foo.localhost', 'bar.localhost']
+        default_namespaces, default_hosts = ['default', 'ingress-nginx'], ['foo.localhost', 'bar.localhost']
+    namespaces = args.namespaces or default_namespaces
+    hosts = args.hosts or default_hosts
     
     print(f"    Namespaces: {namespaces}")
     print(f"    Hosts: {hosts}")
     print(f"    Duration: {args.duration} minutes")
+    if not namespaces:
+        print("==> WARNING: No namespaces to monitor, skipping pod metrics")
+    if not hosts:
+        print("==> WARNING: No ingress hosts to monitor, skipping ingress metrics")
     
     # Collect metrics
-    pod_metrics = collect_pod_metrics(client, namespaces, args.duration)
-    ingress_metrics = collect_ingress_metrics(client, hosts, args.duration)
+    pod_metrics, ingress_metrics = asyncio.run(
+        collect_all(args.prometheus_url, namespaces, hosts, args.duration, cache_dir=cache_dir)
+    )
     
     # Combine metrics
     combined = {
@@ -289,8 +436,13 @@ def main():
     # Save outputs
     if args.output_format in ['json', 'both']:
         json_path = os.path.join(args.output_dir, 'resource_metrics.json')
-        with open(json_path, 'w') as f:
-            json.dump(combined, f, indent=2)
+        if orjson:
+            # Serialize to bytes in one call and write them out in a single syscall
+            with open(json_path, 'wb') as f:
+                f.write(orjson.dumps(combined, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        else:
+            with open(json_path, 'w') as f:
+                json.dump(combined, f, indent=2)
         print(f"==> JSON saved to {json_path}")
     
     if args.output_format in ['markdown', 'both']:
@@ -299,7 +451,8 @@ def main():
         with open(md_path, 'w') as f:
             f.write(md_report)
         print(f"==> Markdown saved to {md_path}")
-        print("\n" + md_report)
+        if args.print_report:
+            print("\n" + md_report)
     
     print("\n==> Metrics collection complete!")
 